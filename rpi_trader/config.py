@@ -12,10 +12,45 @@ SYMBOL = "XAU/USD"
 # Data Fetching Settings
 # #1: Calculate the necessary number of candles
 # History size 100 ensures enough data for Ichimoku (52 candles) and S/R (100 candles).
+# Each symbol/timeframe keeps HISTORY_SIZE candles in a fixed NumPy ring buffer (utils/candle_store.py).
+# Memory per symbol is fixed: len(INTERVALS) * 2 * HISTORY_SIZE * 5 * 8 bytes = 24 KB with the defaults.
 HISTORY_SIZE = 100 
 INTERVALS = ["15min", "30min", "1h"]
+# Bar length of each interval, used to fetch only the missing candles after a warm restart
+INTERVAL_SECONDS = {"15min": 900, "30min": 1800, "1h": 3600}
+
+# Strategy Engine
+# Default time budget per module and cycle (seconds). Modules can override it in register_strategy().
+STRATEGY_TIME_BUDGET = 10.0
 
 # File paths
 TRIGGER_FILE = "trigger.txt"
 # NEW: Persistent storage file for shared state across modules
-STATE_FILE = "state.json"
\ No newline at end of file
+STATE_FILE = "state.json"
+# Binary snapshot of candles and runtime state, loaded at startup for warm restarts
+SNAPSHOT_FILE = "snapshot.npz"
+
+# Telegram messages that failed to send are kept (up to this many) and retried on the next run
+MAX_PENDING_NOTIFICATIONS = 50
+# Pending messages older than this are dropped instead of re-sent (about one cron period, seconds)
+PENDING_NOTIFICATION_MAX_AGE = 900
+# Pause between re-sent messages, to stay under Telegram's rate limit (seconds)
+PENDING_FLUSH_DELAY_SECONDS = 1.0
+
+# Market Data Providers
+# Listed in priority order: the first entry is the primary, the rest are hedged backups.
+# "base_url" may point at any TwelveData-compatible endpoint (mirror, second account, local stand-in).
+DATA_PROVIDERS = [
+    {"type": "twelvedata", "name": "twelvedata_primary", "api_key": TD_API_KEY},
+    {"type": "twelvedata", "name": "twelvedata_backup", "api_key": "YOUR_BACKUP_TWELVEDATA_API_KEY"},
+]
+# Latency budget before the backup provider is fired (seconds)
+HEDGE_DELAY_SECONDS = 2.0
+# Weight of the newest sample in the provider health moving averages (0-1)
+PROVIDER_HEALTH_ALPHA = 0.3
+# Relative score difference needed before a provider outranks one listed before it (0.2 = 20%)
+PROVIDER_SCORE_MARGIN = 0.2
+# Consecutive failures before a provider is skipped, and for how long (seconds)
+# The cooldown is kept well below the 15-minute cron period, so a tripped provider misses one cycle, not two
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_COOLDOWN_SECONDS = 600
@@ -2,7 +2,10 @@ import time
 import os
 import config
 import datetime
-from utils.helpers import fetch_market_data, send_telegram_message
+from utils.helpers import fetch_market_data, send_telegram_message, flush_pending_notifications
+from utils import snapshot_manager
+from utils.strategy_registry import run_strategies
+# Importing the modules registers their strategies (registration order = notification order)
 from modules import (
     close_order_by_rsi,
     kijun_sen_trailing_stop,
@@ -48,49 +51,18 @@ def execute_trading_logic():
     market_data = fetch_market_data()
     
     if market_data:
-        # Divide data for easier use
-        df_m15 = market_data.get('15min')
-        df_m30 = market_data.get('30min')
-        df_h1  = market_data.get('1h')
-
         # #7: Process by Mode
-        if mode == "1" or mode == "2":
-            # --- Mode 1 (BUY) or 2 (SELL): Order Management (Close/Trailing) ---
-            
-            # 1. Close Order by RSI (M30)
-            rsi_signal, rsi_msg = close_order_by_rsi.check_condition(df_m30)
-            
-            if rsi_signal:
-                # Filter RSI message based on current trade mode
-                if mode == "1" and "Bearish" in rsi_msg:
-                    # Mode 1 (Active BUY) only cares about Bearish divergence (Close BUY)
-                    send_telegram_message(rsi_msg)
-                elif mode == "2" and "Bullish" in rsi_msg:
-                    # Mode 2 (Active SELL) only cares about Bullish divergence (Close SELL)
-                    send_telegram_message(rsi_msg)
+        if mode in ["0", "1", "2"]:
+            # Mode 0: Opportunity Search (Entry) / Mode 1 (BUY) or 2 (SELL): Order Management (Close/Trailing)
+            # Every module in modules/ declares which modes and timeframes it applies to,
+            # the registry runs the applicable ones concurrently.
+            results = run_strategies(market_data, mode, config.SYMBOL)
 
-            # 2. Kijun Trailing Stop (H1) - Pass the current mode
-            kijun_signal, kijun_msg = kijun_sen_trailing_stop.check_condition(df_h1, mode)
-            if kijun_signal:
-                # This module only returns True if Kijun moved favorably for the current mode
-                send_telegram_message(kijun_msg)
+            # Notify in registration order, so messages keep a stable sequence
+            for result in results:
+                if result.message:
+                    send_telegram_message(result.message)
 
-        elif mode == "0":
-            # --- Mode 0: Opportunity Search (Entry) ---
-            
-            # 1. Ichimoku Entry Finder
-            ichi_signal, ichi_msg = ichimoku_entry_finder.check_condition(market_data)
-            
-            # If there is an Ichimoku signal (or partial), send message
-            if ichi_msg: 
-                send_telegram_message(ichi_msg)
-            
-            # Only call S/R finder if Ichimoku is satisfied (Signal = True)
-            if ichi_signal:
-                sr_signal, sr_msg = sr_finder.check_condition(df_h1)
-                if sr_signal:
-                    send_telegram_message(sr_msg)
-        
         else:
             print("Invalid mode in trigger.txt. Please use '0', '1', or '2'.")
 
@@ -100,9 +72,15 @@ def execute_trading_logic():
 
 def main():
     print(f"Starting Forex Bot for {config.SYMBOL}...")
+
+    # Warm restart: restore candles and pending notifications from the last snapshot
+    if snapshot_manager.load_snapshot():
+        print("Snapshot restored.")
+        flush_pending_notifications()
     
     # Send startup message only on the very first run (which will be managed by Cron)
-    send_telegram_message(f"🤖 Bot started. Monitoring {config.SYMBOL}...")
+    # Never queued: a burst of stale startup messages after an outage carries no information
+    send_telegram_message(f"🤖 Bot started. Monitoring {config.SYMBOL}...", queue_on_failure=False)
 
     try:
         execute_trading_logic()
@@ -111,5 +89,9 @@ def main():
         print(f"Critical Error during execution: {e}")
         send_telegram_message(f"⚠️ Bot Critical Error: {e}")
 
+    finally:
+        # Written on every (cron) run, so the snapshot is refreshed each cycle
+        snapshot_manager.save_snapshot()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.strategy_registry import register_strategy
 
 def calculate_rsi(series, period=14):
     delta = series.diff()
@@ -48,4 +49,21 @@ def check_condition(df_m30):
         is_signal = True
         msg = f"⚠️ **ALERT**: Bullish RSI Divergence (M30) detected!\nPrice Low: {curr_price}, RSI Higher: {curr_rsi:.2f}.\n**Consider Closing SELL Order.**"
         
-    return is_signal, msg
\ No newline at end of file
+    return is_signal, msg
+
+@register_strategy("close_order_by_rsi", modes=["1", "2"], timeframes=["30min"])
+def run(market_data, mode):
+    """
+    Registry entry point. Only reports the divergence that closes the active trade:
+    - Mode 1 (Active BUY) only cares about Bearish divergence (Close BUY)
+    - Mode 2 (Active SELL) only cares about Bullish divergence (Close SELL)
+    """
+    rsi_signal, rsi_msg = check_condition(market_data['30min'])
+    if not rsi_signal:
+        return False, None
+
+    if mode == "1" and "Bearish" in rsi_msg:
+        return True, rsi_msg
+    if mode == "2" and "Bullish" in rsi_msg:
+        return True, rsi_msg
+    return False, None
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.strategy_registry import register_strategy
 
 def calculate_ichimoku_components(df):
     # Tenkan (9)
@@ -139,4 +140,9 @@ def check_condition(data_store):
     if not is_buy_signal and not is_sell_signal:
         return False, None
 
-    return is_signal, full_msg
\ No newline at end of file
+    return is_signal, full_msg
+
+@register_strategy("ichimoku_entry_finder", modes=["0"], timeframes=["15min", "30min", "1h"])
+def run(market_data, mode):
+    """Registry entry point. Searches for entries in Mode 0."""
+    return check_condition(market_data)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import pandas as pd
+import config
 from utils import storage_manager
+from utils.strategy_registry import register_strategy
 
 # Constant key used to store the Kijun value in the state.json file
 KIJUN_H1_KEY = "kijun_h1_value"
@@ -10,10 +12,12 @@ def check_condition(df_h1, mode):
     - Mode 1 (BUY): Only notifies if Kijun has INCREASED.
     - Mode 2 (SELL): Only notifies if Kijun has DECREASED.
     - Mode 0: This function is not called in mode 0.
-    Return: (bool, message) - True if value changed favorably, False otherwise.
+    Return: (bool, message, state_updates) - True if value changed favorably, False otherwise.
+    The new baseline is returned in state_updates instead of being saved here: the strategy engine
+    saves it only if it accepts the result, so a timed-out run never moves the baseline silently.
     """
     if df_h1 is None:
-        return False, "No Data"
+        return False, "No Data", {}
 
     # Kijun-sen (Base Line) formula: (Max High + Min Low) / 2 over 26 periods
     period = 26
@@ -56,12 +60,11 @@ def check_condition(df_h1, mode):
     
     # 2. Save the new value if it has changed, regardless of notification status, 
     # to maintain the correct "last_kijun" baseline.
-    if has_changed_significantly:
-        storage_manager.save_state(KIJUN_H1_KEY, current_kijun)
+    state_updates = {KIJUN_H1_KEY: current_kijun} if has_changed_significantly else {}
     
     # If we shouldn't notify OR if the value hasn't changed enough to warrant a message
     if not should_notify or not has_changed_significantly:
-        return False, None
+        return False, None, state_updates
     
     # --- Message Creation ---
     
@@ -79,4 +82,13 @@ def check_condition(df_h1, mode):
     msg = f"🛑 **Kijun-Sen Trailing (H1) UPDATE - {order_type}**:\nNew Kijun Value: `{current_kijun:.2f}`\nCurrent Price: `{current_price:.2f}`\n*Hint: {trailing_tip}*"
     
     # Return True to signal that a notification should be sent
-    return True, msg
\ No newline at end of file
+    return True, msg, state_updates
+
+# The Kijun baseline is stored under a single state key, so this module is bound to the configured symbol
+@register_strategy("kijun_sen_trailing_stop", modes=["1", "2"], timeframes=["1h"], symbols=[config.SYMBOL])
+def run(market_data, mode):
+    """Registry entry point. Reports the H1 Kijun only when it moved favorably for the current mode."""
+    kijun_signal, kijun_msg, state_updates = check_condition(market_data['1h'], mode)
+    if not kijun_signal:
+        return False, None, state_updates
+    return True, kijun_msg, state_updates
\ No newline at end of file
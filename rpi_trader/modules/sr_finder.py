@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.strategy_registry import register_strategy
 
 def check_condition(df_h1):
     """
@@ -18,4 +19,10 @@ def check_condition(df_h1):
     
     msg = f"📊 **Support & Resistance (H1)**:\nResistance (Resistance): `{resistance:.2f}` (Used for Sell Stop Loss/Buy Take Profit)\nSupport (Support): `{support:.2f}` (Used for Buy Stop Loss/Sell Take Profit)"
     
-    return True, msg
\ No newline at end of file
+    return True, msg
+
+# Only runs when the Ichimoku Entry returned True in the same cycle
+@register_strategy("sr_finder", modes=["0"], timeframes=["1h"], requires="ichimoku_entry_finder")
+def run(market_data, mode):
+    """Registry entry point. Reports S/R levels for a fresh entry signal."""
+    return check_condition(market_data['1h'])
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Measures fetch_market_data() cycle latency with and without a hedged backup provider.
+
+Two local stand-in servers answer TwelveData-style /time_series requests:
+- primary: answers in --fast seconds, but --slow-ratio of requests take --slow seconds
+- backup: always answers in --backup-delay seconds
+
+Usage (from rpi_trader/): python tools/bench_hedge.py [--cycles 60] [--hedge-delay 0.2]
+Runs in a temporary directory, so the real state.json is never touched.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Make config/utils importable when run as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils import candle_store
+from utils.helpers import fetch_market_data
+
+
+def start_stand_in(delay_fn):
+    """Starts a local TwelveData stand-in. delay_fn() returns the delay (seconds) of each request."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay_fn())
+            query = parse_qs(urlparse(self.path).query)
+            step = config.INTERVAL_SECONDS[query["interval"][0]]
+            size = int(query["outputsize"][0])
+            newest = int(time.time()) // step * step
+            values = [{
+                "datetime": datetime.datetime.fromtimestamp(newest - i * step, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                "open": "2000.0", "high": "2001.0", "low": "1999.0", "close": str(2000.0 + i % 7)
+            } for i in range(size)]
+
+            body = json.dumps({"values": values}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_cycles(providers, cycles, hedge_delay):
+    """Runs fetch_market_data() `cycles` times from a clean state. Returns sorted latencies (seconds)."""
+    config.DATA_PROVIDERS = providers
+    config.HEDGE_DELAY_SECONDS = hedge_delay
+    candle_store.store = candle_store.CandleStore(config.HISTORY_SIZE)
+    if os.path.exists(config.STATE_FILE):
+        os.remove(config.STATE_FILE)
+
+    latencies = []
+    for _ in range(cycles):
+        start = time.monotonic()
+        if fetch_market_data() is None:
+            print("Cycle failed.")
+        latencies.append(time.monotonic() - start)
+    return sorted(latencies)
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=60)
+    parser.add_argument("--hedge-delay", type=float, default=0.2)
+    parser.add_argument("--fast", type=float, default=0.02)
+    parser.add_argument("--slow", type=float, default=3.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.1)
+    parser.add_argument("--backup-delay", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    primary_url = start_stand_in(lambda: args.slow if rng.random() < args.slow_ratio else args.fast)
+    backup_url = start_stand_in(lambda: args.backup_delay)
+
+    primary = {"type": "twelvedata", "name": "primary", "api_key": "bench", "base_url": primary_url}
+    backup = {"type": "twelvedata", "name": "backup", "api_key": "bench", "base_url": backup_url}
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_hedge_"))
+    for label, providers in [("primary only", [primary]), ("hedged", [primary, backup])]:
+        latencies = run_cycles(providers, args.cycles, args.hedge_delay)
+        print(f"{label:>12}: p50 {percentile(latencies, 50):.3f}s  p99 {percentile(latencies, 99):.3f}s  max {latencies[-1]:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import config
+
+# Column layout of every candle row (all float64, timestamp is epoch seconds)
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close')
+TS_COL = 0
+
+
+def rows_from_values(values):
+    """
+    Converts a TwelveData-style "values" list (newest first, string fields) into a
+    float64 array of shape (n, 5) ordered oldest -> newest, without going through pandas.
+    """
+    timestamps = np.array([v['datetime'] for v in values], dtype='datetime64[s]').astype(np.int64)
+    prices = np.array([(v['open'], v['high'], v['low'], v['close']) for v in values], dtype=np.float64)
+
+    rows = np.empty((len(values), len(COLUMNS)), dtype=np.float64)
+    rows[:, TS_COL] = timestamps
+    rows[:, 1:] = prices
+    # Reverse so index 0 is oldest, last index is newest (standard for indicator calculation)
+    return rows[::-1]
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity ring buffer of candles for one symbol/timeframe.
+
+    Storage is a single (2 * capacity, 5) float64 array. Every row is written twice
+    (at pos and pos + capacity), so the newest `capacity` candles are always one
+    contiguous slice and can be handed out as a zero-copy view.
+    See HISTORY_SIZE in config.py for the memory footprint.
+    """
+
+    __slots__ = ('symbol', 'interval', 'capacity', 'count', '_data')
+
+    def __init__(self, symbol, interval, capacity):
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        # Total number of candles ever appended (not capped by capacity)
+        self.count = 0
+        self._data = np.zeros((2 * capacity, len(COLUMNS)), dtype=np.float64)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def last_timestamp(self):
+        """Epoch seconds of the newest candle, or None if the buffer is empty."""
+        if self.count == 0:
+            return None
+        return self._data[(self.count - 1) % self.capacity, TS_COL]
+
+    def _write(self, index, row):
+        pos = index % self.capacity
+        self._data[pos] = row
+        self._data[pos + self.capacity] = row
+
+    def append(self, rows):
+        """
+        Merges candles (oldest -> newest) into the buffer in place.
+        - Newer timestamp: appended (the oldest candle is overwritten once full).
+        - Same timestamp as the newest candle: replaced (the still-forming bar was updated).
+        - Older timestamp: ignored (already stored).
+        Returns the number of new candles appended.
+        """
+        last_ts = self.last_timestamp
+        if last_ts is not None:
+            rows = rows[rows[:, TS_COL] >= last_ts]
+        # Only the newest `capacity` rows can survive, skip writing the rest
+        if len(rows) > self.capacity:
+            rows = rows[-self.capacity:]
+
+        added = 0
+        for row in rows:
+            if last_ts is not None and row[TS_COL] == last_ts:
+                self._write(self.count - 1, row)
+            else:
+                self._write(self.count, row)
+                self.count += 1
+                added += 1
+            last_ts = row[TS_COL]
+        return added
+
+    def missing_bars(self, interval_seconds, now):
+        """
+        Number of candles to request so the buffer catches up to `now` (epoch seconds).
+        Includes the newest stored candle again, since it may still have been forming.
+        Returns capacity (a full history fetch) while the buffer is not yet full.
+        """
+        if len(self) < self.capacity:
+            return self.capacity
+        elapsed_bars = int((now - self.last_timestamp) // interval_seconds)
+        return max(1, min(self.capacity, elapsed_bars + 1))
+
+    def dump(self):
+        """Returns (count, raw storage array) for snapshots. The array is not copied."""
+        return self.count, self._data
+
+    def restore(self, count, data):
+        """Loads state produced by dump(). Raises ValueError if the layout does not match."""
+        if data.shape != self._data.shape:
+            raise ValueError(f"Snapshot shape {data.shape} does not match buffer shape {self._data.shape}")
+        self._data[:] = data
+        self.count = int(count)
+
+    def view(self):
+        """Read-only zero-copy view of the stored candles, oldest -> newest."""
+        size = len(self)
+        start = (self.count - size) % self.capacity
+        window = self._data[start:start + size]
+        window.flags.writeable = False
+        return window
+
+    def frame(self):
+        """
+        DataFrame backed by view() without copying. Modules may add indicator
+        columns to it; those live in the DataFrame and never touch the buffer.
+        """
+        return pd.DataFrame(self.view(), columns=list(COLUMNS), copy=False)
+
+
+class CandleStore:
+    """
+    Holds one CandleBuffer per (symbol, interval).
+    Memory per symbol is fixed, see HISTORY_SIZE in config.py.
+    """
+
+    __slots__ = ('capacity', '_buffers')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buffers = {}
+
+    def get(self, symbol, interval):
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = CandleBuffer(symbol, interval, self.capacity)
+            self._buffers[key] = buffer
+        return buffer
+
+    def buffers(self):
+        return list(self._buffers.values())
+
+
+# Process-wide store shared by data fetching and the modules
+store = CandleStore(config.HISTORY_SIZE)
@@ -0,0 +1,247 @@
+import functools
+import queue
+import threading
+import time
+import requests
+import config
+from utils import storage_manager
+from utils.candle_store import rows_from_values
+
+# Key used to persist provider health between cron runs in state.json
+PROVIDER_HEALTH_KEY = "provider_health"
+
+
+class DataProvider:
+    """
+    Base class for market-data sources.
+    Subclasses implement fetch_raw(symbol, interval, outputsize) and return the newest `outputsize`
+    candles as an array ordered oldest -> newest (shape (n, 5), see utils/candle_store.py).
+    """
+
+    def __init__(self, name, timeout=15):
+        self.name = name
+        self.timeout = timeout
+
+        # --- Health Tracking ---
+        # Exponentially weighted success rate (1.0 = always answers) and latency (seconds)
+        self.success_rate = 1.0
+        self.avg_latency = 0.0
+        # Number of recorded samples. A provider with none has an unknown score.
+        self.samples = 0
+        self.consecutive_failures = 0
+        # Timestamp until which the circuit stays open (provider is skipped)
+        self.open_until = 0.0
+        # Timeframes are fetched concurrently, so health updates are serialized
+        self._lock = threading.Lock()
+
+    def fetch_raw(self, symbol, interval, outputsize):
+        raise NotImplementedError
+
+    def fetch(self, symbol, interval, outputsize):
+        """
+        Fetches one timeframe. Returns the candle array, or None on failure.
+        The outcome is recorded by hedged_fetch(), which also charges providers that lose a hedge.
+        """
+        try:
+            return self.fetch_raw(symbol, interval, outputsize)
+        except Exception as e:
+            print(f"[{self.name}] Exception fetching data {interval}: {e}")
+            return None
+
+    # --- Health Scoring & Circuit Breaker ---
+
+    def record(self, success, latency):
+        with self._lock:
+            self._record(success, latency)
+
+    def record_slow(self, latency):
+        """
+        Charges a provider that had not answered when the hedge was decided.
+        Only the latency is updated: the request may still succeed, so it is not counted as a failure.
+        """
+        with self._lock:
+            self._record_latency(latency)
+
+    def _record_latency(self, latency):
+        alpha = config.PROVIDER_HEALTH_ALPHA
+        if self.samples == 0:
+            # First sample replaces the neutral defaults instead of being averaged with them
+            self.avg_latency = latency
+        else:
+            self.avg_latency = (1 - alpha) * self.avg_latency + alpha * latency
+        self.samples += 1
+
+    def _record(self, success, latency):
+        alpha = config.PROVIDER_HEALTH_ALPHA
+        self.success_rate = (1 - alpha) * self.success_rate + alpha * (1.0 if success else 0.0)
+        self._record_latency(latency)
+
+        if success:
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+        else:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= config.CIRCUIT_FAILURE_THRESHOLD:
+                # Trip the breaker: skip this provider until the cooldown expires
+                self.open_until = time.time() + config.CIRCUIT_COOLDOWN_SECONDS
+                print(f"[{self.name}] Circuit OPEN for {config.CIRCUIT_COOLDOWN_SECONDS}s after {self.consecutive_failures} failures.")
+
+    def is_available(self):
+        # Once the cooldown has passed the provider is "half-open" and gets one trial request
+        return time.time() >= self.open_until
+
+    def is_scored(self):
+        return self.samples > 0
+
+    def health_score(self):
+        """Higher is better. Unreliable or slow providers are ranked lower."""
+        return self.success_rate / (1.0 + self.avg_latency)
+
+    def to_dict(self):
+        return {
+            "success_rate": self.success_rate,
+            "avg_latency": self.avg_latency,
+            "samples": self.samples,
+            "consecutive_failures": self.consecutive_failures,
+            "open_until": self.open_until,
+        }
+
+    def load_dict(self, data):
+        self.success_rate = data.get("success_rate", self.success_rate)
+        self.avg_latency = data.get("avg_latency", self.avg_latency)
+        self.samples = data.get("samples", self.samples)
+        self.consecutive_failures = data.get("consecutive_failures", self.consecutive_failures)
+        self.open_until = data.get("open_until", self.open_until)
+
+
+class TwelveDataProvider(DataProvider):
+    """
+    Provider for the TwelveData /time_series endpoint.
+    base_url can point at any compatible endpoint (e.g. a mirror, or a local stand-in server for latency testing).
+    """
+
+    def __init__(self, name, api_key, base_url="https://api.twelvedata.com", timeout=15):
+        super().__init__(name, timeout)
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+    def fetch_raw(self, symbol, interval, outputsize):
+        url = f"{self.base_url}/time_series"
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "outputsize": outputsize,
+            # Timestamps in UTC so they can be compared with the clock for incremental fetches
+            "timezone": "UTC",
+            "apikey": self.api_key,
+            "format": "JSON"
+        }
+
+        response = requests.get(url, params=params, timeout=self.timeout)
+        data = response.json()
+
+        if "values" not in data:
+            print(f"[{self.name}] Error API response for {interval}: {data}")
+            return None
+
+        return rows_from_values(data["values"])
+
+
+# Maps the "type" field in config.DATA_PROVIDERS to a provider class
+PROVIDER_TYPES = {
+    "twelvedata": TwelveDataProvider,
+}
+
+
+def build_providers():
+    """Creates provider instances from config.DATA_PROVIDERS and restores their saved health."""
+    providers = []
+    for entry in config.DATA_PROVIDERS:
+        options = dict(entry)
+        provider_cls = PROVIDER_TYPES[options.pop("type")]
+        providers.append(provider_cls(**options))
+
+    saved_health = storage_manager.load_state(PROVIDER_HEALTH_KEY, {})
+    for provider in providers:
+        if provider.name in saved_health:
+            provider.load_dict(saved_health[provider.name])
+    return providers
+
+
+def save_provider_health(providers):
+    storage_manager.save_state(PROVIDER_HEALTH_KEY, {p.name: p.to_dict() for p in providers})
+
+
+def _compare_providers(a, b):
+    # Providers without samples rank after scored ones, so an untested backup never outranks the primary
+    if a.is_scored() != b.is_scored():
+        return -1 if a.is_scored() else 1
+    if not a.is_scored():
+        return 0
+
+    score_a, score_b = a.health_score(), b.health_score()
+    # Scores within PROVIDER_SCORE_MARGIN of each other count as equal
+    if abs(score_a - score_b) <= config.PROVIDER_SCORE_MARGIN * max(score_a, score_b):
+        return 0
+    return -1 if score_a > score_b else 1
+
+
+def rank_providers(providers):
+    """
+    Returns providers whose circuit is closed (or half-open), best health score first.
+    Config order is kept unless a provider's score is meaningfully better (sorted() is stable).
+    """
+    available = [p for p in providers if p.is_available()]
+    return sorted(available, key=functools.cmp_to_key(_compare_providers))
+
+
+def hedged_fetch(providers, symbol, interval, outputsize, hedge_delay):
+    """
+    Hedged request: asks the best provider first. If it has not answered within hedge_delay
+    seconds (or it failed), the next provider is fired as well, and the first successful
+    answer wins. Slow losers are left to finish in the background.
+    Every provider that was asked is scored before returning: answered requests with their outcome,
+    requests still in flight with a slow sample of at least hedge_delay.
+    Returns a candle array, or None if every provider failed.
+    """
+    candidates = rank_providers(providers)
+    if not candidates:
+        print(f"No market-data provider available for {interval} (all circuits open).")
+        return None
+
+    results = queue.Queue()
+
+    def worker(provider):
+        results.put((provider, provider.fetch(symbol, interval, outputsize)))
+
+    # provider -> start time of its request, for requests that have not answered yet
+    in_flight = {}
+    next_idx = 0
+    # Daemon threads so a hung loser never delays process exit
+    while True:
+        if next_idx < len(candidates):
+            provider = candidates[next_idx]
+            in_flight[provider] = time.monotonic()
+            threading.Thread(target=worker, args=(provider,), daemon=True).start()
+            next_idx += 1
+
+        if not in_flight:
+            return None
+
+        # Wait for the hedge budget only while there is still a backup to fire
+        wait = hedge_delay if next_idx < len(candidates) else None
+        try:
+            provider, rows = results.get(timeout=wait)
+        except queue.Empty:
+            # Primary is too slow: fire the next provider on the following loop
+            continue
+
+        provider.record(rows is not None, time.monotonic() - in_flight.pop(provider))
+        if rows is not None:
+            if provider is not candidates[0]:
+                print(f"[{interval}] Served by backup provider '{provider.name}'.")
+            # Charge the losers now: their own result would arrive after health is saved
+            now = time.monotonic()
+            for loser, started in in_flight.items():
+                loser.record_slow(max(hedge_delay, now - started))
+            return rows
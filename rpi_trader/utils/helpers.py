@@ -1,10 +1,18 @@
+import datetime
+import time
 import requests
-import pandas as pd
 import config
+from concurrent.futures import ThreadPoolExecutor
+from utils import candle_store
+from utils.data_providers import build_providers, hedged_fetch, save_provider_health
 
-def send_telegram_message(message):
+# (created_at, message) pairs that could not be delivered. Saved in the snapshot and retried on the next run.
+pending_notifications = []
+
+def send_telegram_message(message, queue_on_failure=True):
     """
     #3: Sends a message to the Telegram Bot
+    If the message is not delivered and queue_on_failure is set, it is queued in pending_notifications.
     """
     url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {
@@ -14,45 +22,78 @@ def send_telegram_message(message):
     }
     try:
         response = requests.post(url, json=payload, timeout=10)
-        return response.json()
+        data = response.json()
+        # HTTP errors and {"ok": false} (e.g. 429 rate limit) mean the message was not delivered
+        if not response.ok or not data.get("ok"):
+            raise RuntimeError(f"HTTP {response.status_code}: {data.get('description', data)}")
+        return data
     except Exception as e:
         print(f"Error sending telegram: {e}")
+        if queue_on_failure:
+            pending_notifications.append((time.time(), message))
+            # Keep only the newest messages so the queue stays bounded during long outages
+            del pending_notifications[:-config.MAX_PENDING_NOTIFICATIONS]
         return None
 
-def fetch_market_data():
+def flush_pending_notifications():
     """
-    #1 & #5: Calls the API to fetch data for all 3 timeframes simultaneously (or sequentially).
-    Returns a dictionary containing DataFrames for M15, M30, H1.
+    Retries messages that failed to send on a previous run, oldest first.
+    - Messages older than PENDING_NOTIFICATION_MAX_AGE are dropped: an old alert must not look current.
+    - Re-sent messages are prefixed with the time they were created.
+    - Sends are spaced by PENDING_FLUSH_DELAY_SECONDS, and the flush stops at the first failure
+      (e.g. a 429 rate limit). The rest stays queued for the next run.
     """
-    data_store = {}
-    
-    for interval in config.INTERVALS:
-        url = "https://api.twelvedata.com/time_series"
-        params = {
-            "symbol": config.SYMBOL,
-            "interval": interval,
-            "outputsize": config.HISTORY_SIZE,
-            "apikey": config.TD_API_KEY,
-            "format": "JSON"
+    now = time.time()
+    queued = [(created_at, message) for created_at, message in pending_notifications
+              if now - created_at <= config.PENDING_NOTIFICATION_MAX_AGE]
+    dropped = len(pending_notifications) - len(queued)
+    if dropped:
+        print(f"Dropped {dropped} pending notification(s) older than {config.PENDING_NOTIFICATION_MAX_AGE}s.")
+    pending_notifications.clear()
+
+    for i, (created_at, message) in enumerate(queued):
+        if i > 0:
+            time.sleep(config.PENDING_FLUSH_DELAY_SECONDS)
+        created = datetime.datetime.fromtimestamp(created_at).strftime("%Y-%m-%d %H:%M:%S")
+        if send_telegram_message(f"⏱ *Delayed, created {created}*\n{message}", queue_on_failure=False) is None:
+            # Still undeliverable: keep this and the remaining messages with their original time
+            pending_notifications.extend(queued[i:])
+            break
+
+def fetch_market_data(symbol=config.SYMBOL):
+    """
+    #1 & #5: Fetches data for all 3 timeframes simultaneously.
+    Each timeframe is a hedged request across config.DATA_PROVIDERS (see utils/data_providers.py).
+    New candles are merged in place into the shared candle store (see utils/candle_store.py).
+    After a warm restart only the candles missing since the snapshot are requested.
+    Returns a dictionary containing zero-copy DataFrame views for M15, M30, H1.
+    """
+    providers = build_providers()
+    now = time.time()
+
+    with ThreadPoolExecutor(max_workers=len(config.INTERVALS)) as executor:
+        futures = {
+            interval: executor.submit(
+                hedged_fetch, providers, symbol, interval,
+                candle_store.store.get(symbol, interval).missing_bars(config.INTERVAL_SECONDS[interval], now),
+                config.HEDGE_DELAY_SECONDS
+            )
+            for interval in config.INTERVALS
         }
-        
-        try:
-            response = requests.get(url, params=params, timeout=15)
-            data = response.json()
-            
-            if "values" in data:
-                df = pd.DataFrame(data["values"])
-                # Convert columns to numeric
-                cols = ['open', 'high', 'low', 'close']
-                df[cols] = df[cols].apply(pd.to_numeric)
-                # Reverse so index 0 is oldest, last index is newest (standard for indicator calculation)
-                df = df.iloc[::-1].reset_index(drop=True)
-                data_store[interval] = df
-            else:
-                print(f"Error API response for {interval}: {data}")
-                return None
-        except Exception as e:
-            print(f"Exception fetching data {interval}: {e}")
+        fetched = {interval: future.result() for interval, future in futures.items()}
+
+    # Persist health so circuit breakers survive between cron runs
+    save_provider_health(providers)
+
+    for interval, rows in fetched.items():
+        if rows is None:
+            print(f"All providers failed for {interval}.")
             return None
-            
-    return data_store
\ No newline at end of file
+
+    data_store = {}
+    for interval, rows in fetched.items():
+        buffer = candle_store.store.get(symbol, interval)
+        buffer.append(rows)
+        data_store[interval] = buffer.frame()
+
+    return data_store
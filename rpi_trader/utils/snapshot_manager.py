@@ -0,0 +1,111 @@
+import json
+import os
+import time
+import numpy as np
+import config
+from utils import candle_store, helpers, storage_manager
+
+# Bump whenever the snapshot layout changes. Snapshots with another version are ignored (cold start).
+SNAPSHOT_SCHEMA_VERSION = 2
+
+
+def save_snapshot():
+    """
+    Writes candle buffers, last-seen bar timestamps, pending notifications and the
+    shared state (state.json) to one binary .npz file.
+    The file is written to a temp path first and then renamed, so a crash never leaves a half-written snapshot.
+    """
+    meta = {
+        "schema_version": SNAPSHOT_SCHEMA_VERSION,
+        "saved_at": time.time(),
+        "columns": list(candle_store.COLUMNS),
+        "capacity": candle_store.store.capacity,
+        "buffers": [],
+        "pending_notifications": list(helpers.pending_notifications),
+        "state": storage_manager.load_all_state(),
+    }
+    arrays = {}
+
+    for i, buffer in enumerate(candle_store.store.buffers()):
+        count, data = buffer.dump()
+        meta["buffers"].append({
+            "symbol": buffer.symbol,
+            "interval": buffer.interval,
+            "count": count,
+            "last_timestamp": buffer.last_timestamp,
+        })
+        arrays[f"buffer_{i}"] = data
+
+    tmp_path = config.SNAPSHOT_FILE + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            # Metadata is stored as a plain string array so loading never needs pickle
+            np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config.SNAPSHOT_FILE)
+        return True
+    except Exception as e:
+        print(f"Error saving snapshot to {config.SNAPSHOT_FILE}: {e}")
+        return False
+
+
+def load_snapshot():
+    """
+    Restores the runtime state written by save_snapshot().
+    Everything is read and validated before anything is applied, so a bad snapshot never leaves a half-restored store.
+    Returns True if the snapshot was loaded, False for a cold start (missing, outdated or corrupted file).
+    """
+    if not os.path.exists(config.SNAPSHOT_FILE):
+        return False
+
+    try:
+        with np.load(config.SNAPSHOT_FILE, allow_pickle=False) as snapshot:
+            meta = json.loads(str(snapshot["meta"]))
+
+            if meta.get("schema_version") != SNAPSHOT_SCHEMA_VERSION:
+                print(f"Warning: Snapshot schema version {meta.get('schema_version')} != {SNAPSHOT_SCHEMA_VERSION}. Starting cold.")
+                return False
+
+            # 1. Read and validate every candle buffer
+            # Buffers are only reusable if the row layout and history size did not change
+            buffers = []
+            if meta["columns"] == list(candle_store.COLUMNS) and meta["capacity"] == candle_store.store.capacity:
+                expected_shape = (2 * candle_store.store.capacity, len(candle_store.COLUMNS))
+                for i, info in enumerate(meta["buffers"]):
+                    # Buffers of symbols/timeframes that are no longer configured are dropped,
+                    # so memory stays fixed after changing SYMBOL or INTERVALS
+                    if info["symbol"] != config.SYMBOL or info["interval"] not in config.INTERVALS:
+                        continue
+                    data = snapshot[f"buffer_{i}"]
+                    if data.shape != expected_shape or data.dtype != np.float64:
+                        raise ValueError(f"buffer_{i} has shape {data.shape} / dtype {data.dtype}, expected {expected_shape} / float64")
+                    if not isinstance(info["count"], int) or info["count"] < 0:
+                        raise ValueError(f"buffer_{i} has invalid count {info['count']!r}")
+                    buffers.append((info, data))
+            else:
+                print("Warning: Candle layout changed since the snapshot. Candles will be refetched.")
+
+        pending = meta["pending_notifications"]
+        state = meta["state"]
+        if not isinstance(pending, list) or not isinstance(state, dict):
+            raise ValueError("pending_notifications or state has an invalid type")
+        if not all(isinstance(entry, list) and len(entry) == 2 for entry in pending):
+            raise ValueError("pending_notifications entries must be [created_at, message]")
+
+        # 2. Apply: nothing below is expected to fail on validated data
+        for info, data in buffers:
+            candle_store.store.get(info["symbol"], info["interval"]).restore(info["count"], data)
+
+        helpers.pending_notifications.extend((created_at, message) for created_at, message in pending)
+
+        # Only fill in keys missing from state.json: the state file stays the source of truth
+        current_state = storage_manager.load_all_state()
+        for key, value in state.items():
+            if key not in current_state:
+                storage_manager.save_state(key, value)
+
+        return True
+    except Exception as e:
+        print(f"Error loading snapshot from {config.SNAPSHOT_FILE}: {e}")
+        return False
@@ -1,53 +1,69 @@
 import json
 import os
+import threading
 from config import STATE_FILE
 
+_state_lock = threading.Lock()
+
 def load_state(key, default_value=None):
     """
     Loads a specific value by key from the global state file (state.json).
     Returns the value, or default_value if the key/file is not found.
     """
+    return load_all_state().get(key, default_value)
+
+def load_all_state():
+    """
+    Loads the whole global state file (state.json) as a dictionary.
+    Returns an empty dictionary if the file is missing or corrupted.
+    """
     if not os.path.exists(STATE_FILE):
-        return default_value
-    
+        return {}
+
     try:
         with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-            return state.get(key, default_value)
+            return json.load(f)
     except json.JSONDecodeError:
-        # Handle case where file is empty or corrupted JSON
-        print(f"Warning: {STATE_FILE} file corrupted or empty. Returning default value.")
-        return default_value
+        print(f"Warning: {STATE_FILE} file corrupted or empty. Returning empty state.")
+        return {}
     except Exception as e:
         print(f"Error loading state from {STATE_FILE}: {e}")
-        return default_value
+        return {}
 
 def save_state(key, value):
     """
     Saves a key-value pair to the global state file (state.json).
+    The file is written to a temp path and then renamed, so an interrupted write
+    (e.g. a module abandoned after its time budget when the process exits) never truncates it.
     """
-    state = {}
-    
-    # 1. Load existing state first
-    if os.path.exists(STATE_FILE):
+    # Modules run concurrently: serialize the read-modify-write so no update is lost
+    with _state_lock:
+        state = {}
+
+        # 1. Load existing state first
+        if os.path.exists(STATE_FILE):
+            try:
+                with open(STATE_FILE, 'r') as f:
+                    state = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                # If corrupted or empty, start with an empty state
+                state = {}
+            except Exception as e:
+                print(f"Error loading state before saving: {e}")
+                return False
+
+        # 2. Update the specific key
+        state[key] = value
+
+        # 3. Write back the updated state atomically
+        tmp_path = STATE_FILE + ".tmp"
         try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            # If corrupted or empty, start with an empty state
-            state = {}
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, STATE_FILE)
+            return True
         except Exception as e:
-            print(f"Error loading state before saving: {e}")
+            print(f"Error saving state to {STATE_FILE}: {e}")
             return False
-
-    # 2. Update the specific key
-    state[key] = value
-
-    # 3. Write back the updated state
-    try:
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=4)
-        return True
-    except Exception as e:
-        print(f"Error saving state to {STATE_FILE}: {e}")
-        return False
\ No newline at end of file
@@ -0,0 +1,159 @@
+import threading
+import time
+import config
+from utils import storage_manager
+
+# name -> Strategy, in registration (import) order. Notifications are sent in this order.
+STRATEGIES = {}
+
+
+class Strategy:
+    """A module entry point plus the modes, timeframes and symbols it applies to."""
+
+    __slots__ = ('name', 'func', 'modes', 'timeframes', 'symbols', 'requires', 'time_budget')
+
+    def __init__(self, name, func, modes, timeframes, symbols=None, requires=None, time_budget=None):
+        self.name = name
+        self.func = func
+        self.modes = tuple(modes)
+        self.timeframes = tuple(timeframes)
+        # None means every symbol
+        self.symbols = tuple(symbols) if symbols else None
+        # Name of a strategy that must have signalled True in this cycle before this one runs
+        self.requires = requires
+        self.time_budget = time_budget if time_budget is not None else config.STRATEGY_TIME_BUDGET
+
+    def applies_to(self, mode, symbol, market_data):
+        if mode not in self.modes:
+            return False
+        if self.symbols is not None and symbol not in self.symbols:
+            return False
+        return all(market_data.get(tf) is not None for tf in self.timeframes)
+
+
+class StrategyResult:
+    """Outcome of one strategy run. status is 'ok', 'error', 'timeout' or 'skipped'."""
+
+    __slots__ = ('name', 'status', 'signal', 'message', 'elapsed', 'state')
+
+    def __init__(self, name, status, signal=False, message=None, elapsed=0.0, state=None):
+        self.name = name
+        self.status = status
+        self.signal = signal
+        self.message = message
+        self.elapsed = elapsed
+        # State updates (key -> value) saved to state.json only if the result is accepted
+        self.state = state or {}
+
+
+def register_strategy(name, modes, timeframes, symbols=None, requires=None, time_budget=None):
+    """
+    Decorator for a module's run(market_data, mode) function, which returns (bool, message)
+    or (bool, message, state_updates).
+    The engine only passes the declared timeframes, each as a DataFrame of its own,
+    so modules may add indicator columns without affecting concurrently running modules.
+    symbols=None applies to every symbol. Modules that keep single-symbol state must list their symbols.
+
+    Modules must not write state.json themselves: a module that overruns its budget keeps running
+    after its result is discarded. Return state_updates instead; the engine saves them only
+    for results it accepts (status 'ok').
+    """
+    def decorator(func):
+        STRATEGIES[name] = Strategy(name, func, modes, timeframes, symbols, requires, time_budget)
+        return func
+    return decorator
+
+
+class _Run:
+    """One strategy execution in this cycle. Dependents start as soon as their requirement has a result."""
+
+    __slots__ = ('strategy', 'started', 'done', 'deadline', 'finished_at', 'result')
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        # Set when the budget starts counting (or the run is skipped), i.e. once deadline is known
+        self.started = threading.Event()
+        # Set when result is available
+        self.done = threading.Event()
+        self.deadline = None
+        self.finished_at = None
+        self.result = None
+
+    def start(self, market_data, mode, runs):
+        # Shallow copies share the candle data but not the column set
+        data = {tf: market_data[tf].copy(deep=False) for tf in self.strategy.timeframes}
+        # Daemon thread: a module that overruns its budget is abandoned, never waited for
+        threading.Thread(target=self._worker, args=(data, mode, runs), daemon=True).start()
+
+    def _worker(self, data, mode, runs):
+        strategy = self.strategy
+        if strategy.requires is not None:
+            required = runs[strategy.requires].wait()
+            if required is None or not required.signal:
+                self._finish(StrategyResult(strategy.name, "skipped"), started=False)
+                return
+
+        self.deadline = time.monotonic() + strategy.time_budget
+        self.started.set()
+        start = time.perf_counter()
+        try:
+            output = strategy.func(data, mode)
+            signal, message = output[0], output[1]
+            state = output[2] if len(output) > 2 else None
+            self._finish(StrategyResult(strategy.name, "ok", bool(signal), message, time.perf_counter() - start, state))
+        except Exception as e:
+            print(f"[{strategy.name}] Error: {e}")
+            self._finish(StrategyResult(strategy.name, "error", elapsed=time.perf_counter() - start))
+
+    def _finish(self, result, started=True):
+        self.result = result
+        self.finished_at = time.monotonic()
+        if not started:
+            self.deadline = self.finished_at
+        # done before started, so wait() never sees a skipped run's zero budget without its result
+        self.done.set()
+        self.started.set()
+
+    def wait(self):
+        """Waits until the result is available or the budget has run out. Returns the result, or None on timeout."""
+        self.started.wait()
+        self.done.wait(max(0.0, self.deadline - time.monotonic()))
+        # A result that arrived after the deadline is late, even if nobody was waiting for it at the time
+        if not self.done.is_set() or self.finished_at > self.deadline:
+            return None
+        return self.result
+
+
+def run_strategies(market_data, mode, symbol=config.SYMBOL):
+    """
+    Runs every registered strategy applicable to mode/symbol concurrently, each within its time budget.
+    A strategy with `requires` starts as soon as the required strategy has a result, and only if it signalled True.
+    Failures and timeouts are isolated to the strategy concerned.
+    State updates of accepted results are saved to state.json.
+    Returns a list of StrategyResult in registration order and prints the execution time of each.
+    """
+    applicable = [s for s in STRATEGIES.values() if s.applies_to(mode, symbol, market_data)]
+    names = {s.name for s in applicable}
+    # A dependent whose required strategy is not applicable in this mode cannot run
+    runs = {s.name: _Run(s) for s in applicable if s.requires is None or s.requires in names}
+
+    for run in runs.values():
+        run.start(market_data, mode, runs)
+
+    results = {}
+    for name, run in runs.items():
+        result = run.wait()
+        if result is None:
+            budget = run.strategy.time_budget
+            print(f"[{name}] Exceeded time budget of {budget}s. Result discarded.")
+            result = StrategyResult(name, "timeout", elapsed=budget)
+        results[name] = result
+
+    ordered = [results[name] for name in STRATEGIES if name in results]
+    for result in ordered:
+        # Only accepted results may change persistent state
+        if result.status == "ok":
+            for key, value in result.state.items():
+                storage_manager.save_state(key, value)
+        print(f"[{result.name}] {result.status} in {result.elapsed * 1000:.1f} ms (signal: {result.signal})")
+    return ordered